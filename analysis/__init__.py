@@ -0,0 +1,7 @@
+from analysis.dag import CACHE_DIR, run
+from analysis.tasks import ANALYSES
+
+
+def run_analyses(targets=None, workers=None, cache_dir=CACHE_DIR, log=print):
+    # Jalankan analisis notebook sebagai graf task dengan cache di disk
+    return run(targets or ANALYSES, workers=workers, cache_dir=cache_dir, log=log)
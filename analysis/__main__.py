@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from analysis import run_analyses
+from analysis.dag import CACHE_DIR
+from analysis.tasks import ANALYSES
+
+MAIN_DATA_PATH = 'dashboard/main_data.csv'
+
+
+# Jalankan dari root repositori:
+#   python -m analysis [task ...] [--workers N] [--export]
+def main():
+    parser = argparse.ArgumentParser(description="Jalankan analisis notebook sebagai graf task paralel dengan cache")
+    parser.add_argument('targets', nargs='*', default=ANALYSES, help="Task yang ingin dijalankan")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses worker (1 = serial)")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Direktori cache hasil task")
+    parser.add_argument('--export', action='store_true', help="Simpan hasil main_data ke dashboard/main_data.csv")
+    args = parser.parse_args()
+
+    targets = list(args.targets)
+    if args.export and 'main_data' not in targets:
+        targets.append('main_data')
+
+    start = time.perf_counter()
+    results = run_analyses(targets, workers=args.workers, cache_dir=args.cache_dir)
+    print(f"Selesai dalam {time.perf_counter() - start:.2f} detik")
+
+    if args.export:
+        results['main_data'].to_csv(MAIN_DATA_PATH, index=False)
+        print(f"File {MAIN_DATA_PATH} telah berhasil dibuat.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+CACHE_DIR = '.cache/analysis'
+
+# Naikkan versi ini jika format cache berubah agar semua hasil lama diabaikan
+CACHE_VERSION = 1
+
+# Registri semua task: nama -> {'func', 'deps', 'files', 'module'}
+TASKS = {}
+
+
+def task(*deps, files=()):
+    # Dekorator untuk mendaftarkan fungsi sebagai task di dalam graf.
+    # deps: nama task lain yang hasilnya dipakai sebagai argumen (urutannya sama),
+    # files: file input yang isinya ikut menentukan hash task.
+    def register(func):
+        TASKS[func.__name__] = {
+            'func': func,
+            'deps': tuple(deps),
+            'files': tuple(files),
+            'module': func.__module__,
+        }
+        return func
+    return register
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resolve_order(targets):
+    # Urutan topologis dari semua task yang dibutuhkan oleh targets
+    order = []
+    state = {}
+
+    def visit(name, path):
+        if name not in TASKS:
+            raise KeyError(f"Task tidak dikenal: {name}")
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Siklus dependensi: {' -> '.join(path + [name])}")
+        state[name] = 'visiting'
+        for dep in TASKS[name]['deps']:
+            visit(dep, path + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for target in targets:
+        visit(target, [])
+    return order
+
+
+def code_names(code):
+    # Semua nama global yang dirujuk sebuah fungsi, termasuk fungsi bersarang
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= code_names(const)
+    return names
+
+
+def global_inputs(func, seen=None):
+    # Nilai tingkat modul (konstanta, path, dsb.) dan sumber fungsi bantu di modul
+    # yang sama yang dibaca oleh task, agar perubahannya ikut mengubah hash task
+    seen = set() if seen is None else seen
+    seen.add(func)
+    parts = []
+    for name in sorted(code_names(func.__code__)):
+        if name not in func.__globals__:
+            continue
+        value = func.__globals__[name]
+        if inspect.ismodule(value):
+            continue
+        if callable(value):
+            if inspect.isfunction(value) and value.__module__ == func.__module__ and value not in seen:
+                parts.append(f"{name}:{inspect.getsource(value)}")
+                parts.extend(global_inputs(value, seen))
+            continue
+        parts.append(f"{name}={value!r}")
+    return parts
+
+
+def task_keys(order):
+    # Hash setiap task dihitung dari kode sumbernya, nilai global yang dibacanya,
+    # isi file input, dan hash dependensinya, sehingga perubahan di hulu merambat ke hilir
+    keys = {}
+    file_hashes = {}
+    for name in order:
+        spec = TASKS[name]
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}:{name}".encode())
+        digest.update(inspect.getsource(spec['func']).encode())
+        for part in global_inputs(spec['func']):
+            digest.update(part.encode())
+        for path in spec['files']:
+            if path not in file_hashes:
+                file_hashes[path] = file_digest(path)
+            digest.update(f"{path}:{file_hashes[path]}".encode())
+        for dep in spec['deps']:
+            digest.update(keys[dep].encode())
+        keys[name] = digest.hexdigest()
+    return keys
+
+
+def result_path(name, key, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{name}-{key[:16]}.pkl")
+
+
+def remove_stale_results(name, keep_path):
+    # Hapus hasil lama task ini (kunci berbeda) agar cache tidak terus membesar
+    cache_dir = os.path.dirname(keep_path)
+    prefix = f"{name}-"
+    for filename in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, filename)
+        if filename.startswith(prefix) and filename.endswith('.pkl') and path != keep_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_result(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def execute_task(module, name, dep_paths, out_path):
+    # Dijalankan di worker: muat hasil dependensi dari disk, hitung, simpan ke disk
+    importlib.import_module(module)
+    spec = TASKS[name]
+    args = [load_result(path) for path in dep_paths]
+    result = spec['func'](*args)
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, out_path)
+    remove_stale_results(name, out_path)
+    return name
+
+
+def run(targets, workers=None, cache_dir=CACHE_DIR, log=print):
+    order = resolve_order(targets)
+    keys = task_keys(order)
+    paths = {name: result_path(name, keys[name], cache_dir) for name in order}
+
+    # Task yang hasilnya sudah ada di cache tidak perlu dijalankan lagi
+    done = {name for name in order if os.path.exists(paths[name])}
+    pending = [name for name in order if name not in done]
+    for name in order:
+        if name in done and log:
+            log(f"[cache] {name}")
+
+    def submit_ready(submit, running):
+        for name in list(pending):
+            if all(dep in done for dep in TASKS[name]['deps']):
+                pending.remove(name)
+                dep_paths = [paths[dep] for dep in TASKS[name]['deps']]
+                running[submit(TASKS[name]['module'], name, dep_paths, paths[name])] = name
+
+    if pending and workers == 1:
+        # Mode serial di proses yang sama (berguna untuk debugging)
+        while pending:
+            running = {}
+            submit_ready(lambda *args: execute_task(*args), running)
+            for name in running.values():
+                done.add(name)
+                if log:
+                    log(f"[run] {name}")
+    elif pending:
+        # Task yang saling independen dijalankan paralel di proses worker terpisah
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            submit_ready(lambda *args: executor.submit(execute_task, *args), running)
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    future.result()
+                    done.add(name)
+                    if log:
+                        log(f"[run] {name}")
+                submit_ready(lambda *args: executor.submit(execute_task, *args), running)
+
+    return {name: load_result(paths[name]) for name in targets}
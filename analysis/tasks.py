@@ -0,0 +1,435 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from analysis.dag import task
+
+DATA_DIR = 'data'
+
+ORDER_DATETIME_COLUMNS = [
+    'order_purchase_timestamp',
+    'order_approved_at',
+    'order_delivered_carrier_date',
+    'order_delivered_customer_date',
+    'order_estimated_delivery_date'
+]
+
+INSTALLMENT_BINS = [0, 1, 5, 12, float('inf')]
+INSTALLMENT_LABELS = ['Pembayaran Langsung', 'Cicilan 2-5', 'Cicilan 6-12', 'Cicilan >12']
+
+
+# ----- Data sumber -----
+
+@task(files=[f'{DATA_DIR}/sellers_dataset.csv'])
+def sellers():
+    sellers_df = pd.read_csv(f'{DATA_DIR}/sellers_dataset.csv')
+    # Normalisasi kode pos menjadi format 5 digit dengan padding 0
+    sellers_df['seller_zip_code_prefix_normalized'] = sellers_df['seller_zip_code_prefix'].astype(str).str.zfill(5)
+    return sellers_df
+
+
+@task(files=[f'{DATA_DIR}/product_category_name_translation.csv'])
+def product_categories():
+    return pd.read_csv(f'{DATA_DIR}/product_category_name_translation.csv')
+
+
+@task(files=[f'{DATA_DIR}/products_dataset.csv'])
+def products():
+    return pd.read_csv(f'{DATA_DIR}/products_dataset.csv')
+
+
+@task(files=[f'{DATA_DIR}/customers_dataset.csv'])
+def customers():
+    return pd.read_csv(f'{DATA_DIR}/customers_dataset.csv')
+
+
+@task(files=[f'{DATA_DIR}/orders_dataset.csv'])
+def orders():
+    # Konversi kolom timestamp ke datetime cukup dilakukan sekali di sini
+    orders_df = pd.read_csv(f'{DATA_DIR}/orders_dataset.csv')
+    for col in ORDER_DATETIME_COLUMNS:
+        orders_df[col] = pd.to_datetime(orders_df[col], errors='coerce')
+    return orders_df
+
+
+@task(files=[f'{DATA_DIR}/order_items_dataset.csv'])
+def order_items():
+    order_items_df = pd.read_csv(f'{DATA_DIR}/order_items_dataset.csv')
+    order_items_df['shipping_limit_date'] = pd.to_datetime(order_items_df['shipping_limit_date'])
+    return order_items_df
+
+
+@task(files=[f'{DATA_DIR}/order_payments_dataset.csv'])
+def order_payments():
+    return pd.read_csv(f'{DATA_DIR}/order_payments_dataset.csv')
+
+
+@task(files=[f'{DATA_DIR}/order_reviews_dataset.csv'])
+def order_reviews():
+    order_reviews_df = pd.read_csv(f'{DATA_DIR}/order_reviews_dataset.csv')
+    order_reviews_df['review_creation_date'] = pd.to_datetime(order_reviews_df['review_creation_date'])
+    order_reviews_df['review_answer_timestamp'] = pd.to_datetime(order_reviews_df['review_answer_timestamp'])
+    return order_reviews_df
+
+
+# ----- Join bersama yang dipakai oleh beberapa analisis -----
+
+@task('orders', 'order_items')
+def orders_items(orders_df, order_items_df):
+    return orders_df.merge(order_items_df, on='order_id', how='inner')
+
+
+@task('orders_items', 'products')
+def orders_items_products(orders_items_df, products_df):
+    return orders_items_df.merge(
+        products_df[['product_id', 'product_category_name', 'product_photos_qty']],
+        on='product_id',
+        how='inner'
+    )
+
+
+@task('orders_items_products', 'sellers')
+def orders_items_products_sellers(orders_items_products_df, sellers_df):
+    return orders_items_products_df.merge(sellers_df, on='seller_id', how='inner')
+
+
+# ----- Analisis per pertanyaan bisnis -----
+
+@task('orders_items_products')
+def photo_conversion(orders_items_products_df):
+    # Pertanyaan 1: konversi produk foto tunggal vs >3 foto pada tahun 2018
+    orders_items_products_2018 = orders_items_products_df[
+        orders_items_products_df['order_purchase_timestamp'].dt.year == 2018
+    ]
+
+    single_photo_products = orders_items_products_2018[orders_items_products_2018['product_photos_qty'] == 1]
+    multi_photo_products = orders_items_products_2018[orders_items_products_2018['product_photos_qty'] > 3]
+
+    # Konversi = pesanan berstatus 'delivered' dibanding total pesanan
+    single_photo_delivered = single_photo_products[single_photo_products['order_status'] == 'delivered']
+    multi_photo_delivered = multi_photo_products[multi_photo_products['order_status'] == 'delivered']
+
+    photo_results = pd.DataFrame({
+        'Kategori': ['Produk Foto Tunggal', 'Produk >3 Foto'],
+        'Tingkat Konversi (%)': [
+            len(single_photo_delivered) / len(single_photo_products) * 100,
+            len(multi_photo_delivered) / len(multi_photo_products) * 100
+        ],
+        'Rata-rata Nilai Pesanan (R$)': [single_photo_products['price'].mean(), multi_photo_products['price'].mean()],
+        'Jumlah Produk Unik': [single_photo_products['product_id'].nunique(), multi_photo_products['product_id'].nunique()]
+    })
+
+    def by_category(df):
+        return df.groupby('product_category_name').agg(
+            jumlah_pesanan=('order_id', 'count'),
+            rata_rata_harga=('price', 'mean')
+        ).reset_index().sort_values('jumlah_pesanan', ascending=False)
+
+    return {
+        'summary': photo_results,
+        'single_photo_by_category': by_category(single_photo_products),
+        'multi_photo_by_category': by_category(multi_photo_products),
+    }
+
+
+@task('orders_items_products', 'order_reviews', 'product_categories')
+def late_delivery_reviews(orders_items_products_df, order_reviews_df, product_categories_df):
+    # Pertanyaan 2: penurunan review score untuk pesanan terlambat (2017-2018)
+    df = orders_items_products_df[
+        (orders_items_products_df['order_purchase_timestamp'] >= pd.to_datetime('2017-01-01')) &
+        (orders_items_products_df['order_purchase_timestamp'] <= pd.to_datetime('2018-12-31')) &
+        (orders_items_products_df['order_status'] == 'delivered') &
+        (orders_items_products_df['order_delivered_customer_date'].notna())
+    ].copy()
+
+    df['is_late'] = df['order_delivered_customer_date'] > df['order_estimated_delivery_date']
+    df['delivery_delay_days'] = (df['order_delivered_customer_date'] - df['order_estimated_delivery_date']).dt.days
+
+    df = df.merge(
+        order_reviews_df[['order_id', 'review_score', 'review_creation_date']],
+        on='order_id',
+        how='inner'
+    ).merge(
+        product_categories_df[['product_category_name', 'product_category_name_english']],
+        on='product_category_name',
+        how='left'
+    )
+
+    avg_score_on_time = df.loc[~df['is_late'], 'review_score'].mean()
+    avg_score_late = df.loc[df['is_late'], 'review_score'].mean()
+
+    # Analisis per kategori produk
+    grouped = df.groupby(['product_category_name', 'is_late'])['review_score'].agg(['mean', 'count']).unstack('is_late')
+    category_impact = pd.DataFrame({
+        'avg_score_on_time': grouped[('mean', False)] if ('mean', False) in grouped else np.nan,
+        'avg_score_late': grouped[('mean', True)] if ('mean', True) in grouped else np.nan,
+        'on_time_orders_count': grouped[('count', False)].fillna(0) if ('count', False) in grouped else 0,
+        'late_orders_count': grouped[('count', True)].fillna(0) if ('count', True) in grouped else 0,
+    })
+    category_impact['score_decrease'] = category_impact['avg_score_on_time'] - category_impact['avg_score_late']
+    category_impact['score_decrease_percentage'] = np.where(
+        category_impact['on_time_orders_count'] > 0,
+        category_impact['score_decrease'] / category_impact['avg_score_on_time'] * 100,
+        0
+    )
+    category_impact['total_orders'] = category_impact['on_time_orders_count'] + category_impact['late_orders_count']
+    category_impact['late_percentage'] = category_impact['late_orders_count'] / category_impact['total_orders'] * 100
+    category_impact = category_impact.reset_index()
+
+    # Hanya kategori dengan minimal 100 pesanan
+    most_impacted_categories = category_impact[category_impact['total_orders'] >= 100].sort_values(
+        'score_decrease_percentage', ascending=False
+    )
+
+    return {
+        'avg_score_on_time': avg_score_on_time,
+        'avg_score_late': avg_score_late,
+        'score_decrease_percentage': (avg_score_on_time - avg_score_late) / avg_score_on_time * 100,
+        'on_time_count': int((~df['is_late']).sum()),
+        'late_count': int(df['is_late'].sum()),
+        'category_impact': most_impacted_categories,
+    }
+
+
+@task('orders_items', 'customers')
+def state_quarterly_trends(orders_items_df, customers_df):
+    # Pertanyaan 3: nilai pesanan 5 negara bagian teratas vs terbawah per kuartal
+    df = orders_items_df.merge(customers_df[['customer_id', 'customer_state']], on='customer_id', how='inner')
+    df['order_value'] = df['price'] + df['freight_value']
+    df['year_quarter'] = (
+        df['order_purchase_timestamp'].dt.year.astype(str) + '-Q' +
+        df['order_purchase_timestamp'].dt.quarter.astype(str)
+    )
+
+    state_customer_counts = customers_df['customer_state'].value_counts().reset_index()
+    state_customer_counts.columns = ['customer_state', 'customer_count']
+    top_5_states = state_customer_counts.head(5)['customer_state'].tolist()
+    bottom_5_states = state_customer_counts.tail(5)['customer_state'].tolist()
+
+    df['state_category'] = 'Other'
+    df.loc[df['customer_state'].isin(top_5_states), 'state_category'] = 'Top 5'
+    df.loc[df['customer_state'].isin(bottom_5_states), 'state_category'] = 'Bottom 5'
+
+    state_avg_order = df.groupby('customer_state')['order_value'].mean().reset_index().merge(
+        state_customer_counts, on='customer_state', how='left'
+    )
+    top_5_avg_order = state_avg_order[state_avg_order['customer_state'].isin(top_5_states)]['order_value'].mean()
+    bottom_5_avg_order = state_avg_order[state_avg_order['customer_state'].isin(bottom_5_states)]['order_value'].mean()
+
+    quarterly_pivot = df.groupby(['year_quarter', 'state_category'])['order_value'].mean().unstack('state_category')
+    for col in ['Top 5', 'Bottom 5']:
+        if col not in quarterly_pivot.columns:
+            quarterly_pivot[col] = np.nan
+    quarterly_pivot['Difference'] = quarterly_pivot['Top 5'] - quarterly_pivot['Bottom 5']
+    quarterly_pivot['Difference_Pct'] = (
+        quarterly_pivot['Difference'] / quarterly_pivot['Bottom 5'].where(quarterly_pivot['Bottom 5'] > 0) * 100
+    )
+    quarterly_pivot = quarterly_pivot.reset_index().sort_values('year_quarter')
+
+    return {
+        'top_5_states': top_5_states,
+        'bottom_5_states': bottom_5_states,
+        'state_avg_order': state_avg_order,
+        'top_5_avg_order': top_5_avg_order,
+        'bottom_5_avg_order': bottom_5_avg_order,
+        'quarterly': quarterly_pivot,
+    }
+
+
+@task('orders_items_products', 'order_payments')
+def installment_revenue(orders_items_products_df, order_payments_df):
+    # Pertanyaan 4: pendapatan cicilan 6-12 kali vs pembayaran langsung (2018)
+    df = orders_items_products_df[
+        (orders_items_products_df['order_purchase_timestamp'] >= pd.to_datetime('2018-01-01')) &
+        (orders_items_products_df['order_purchase_timestamp'] <= pd.to_datetime('2018-12-31')) &
+        (orders_items_products_df['order_status'] == 'delivered')
+    ].merge(order_payments_df, on='order_id', how='inner')
+
+    df['installment_category'] = pd.cut(
+        df['payment_installments'],
+        bins=INSTALLMENT_BINS,
+        labels=INSTALLMENT_LABELS,
+        right=True
+    )
+
+    seller_revenue_pivot = df.pivot_table(
+        index=['seller_id', 'product_category_name'],
+        columns='installment_category',
+        values='price',
+        aggfunc='sum',
+        fill_value=0,
+        observed=False
+    ).reset_index()
+
+    # Penjual yang menawarkan cicilan 6-12 kali dan pembayaran langsung dalam kategori yang sama
+    sellers_with_both = seller_revenue_pivot[
+        (seller_revenue_pivot['Pembayaran Langsung'] > 0) &
+        (seller_revenue_pivot['Cicilan 6-12'] > 0)
+    ].copy()
+    sellers_with_both['revenue_increase'] = sellers_with_both['Cicilan 6-12'] - sellers_with_both['Pembayaran Langsung']
+    sellers_with_both['revenue_increase_pct'] = (
+        sellers_with_both['revenue_increase'] / sellers_with_both['Pembayaran Langsung'] * 100
+    )
+
+    category_increase = sellers_with_both.groupby('product_category_name').agg({
+        'Pembayaran Langsung': 'sum',
+        'Cicilan 6-12': 'sum',
+        'revenue_increase_pct': 'mean',
+        'seller_id': 'count'
+    }).reset_index().rename(columns={'seller_id': 'seller_count'})
+    category_increase['category_revenue_increase_pct'] = (
+        (category_increase['Cicilan 6-12'] - category_increase['Pembayaran Langsung']) /
+        category_increase['Pembayaran Langsung'] * 100
+    )
+
+    return {
+        'avg_increase': sellers_with_both['revenue_increase_pct'].mean(),
+        'median_increase': sellers_with_both['revenue_increase_pct'].median(),
+        'sellers_with_both': sellers_with_both,
+        'category_increase': category_increase.sort_values('category_revenue_increase_pct', ascending=False),
+        'installment_distribution': df['payment_installments'].value_counts().sort_index(),
+        'avg_transaction_value': df.groupby('installment_category', observed=False)['price'].mean(),
+    }
+
+
+@task('orders', 'orders_items_products_sellers')
+def ibitinga_cluster(orders_df, orders_items_products_sellers_df):
+    # Pertanyaan 5: performa klaster Ibitinga vs kota lain (6 bulan terakhir).
+    # Tanggal terakhir diambil dari seluruh pesanan (termasuk yang tanpa item), sama seperti notebook
+    last_date = orders_df['order_purchase_timestamp'].max()
+    six_months_ago = last_date - timedelta(days=180)
+
+    df = orders_items_products_sellers_df[
+        orders_items_products_sellers_df['order_purchase_timestamp'] >= six_months_ago
+    ].copy()
+    df['is_ibitinga'] = df['seller_city'] == 'ibitinga'
+    # Margin keuntungan sederhana: price - freight_value
+    df['profit_margin'] = df['price'] - df['freight_value']
+    df['profit_margin_pct'] = df['profit_margin'] / df['price'] * 100
+
+    top_categories_ibitinga = df[df['is_ibitinga']].groupby('product_category_name')['price'].sum().nlargest(10).index.tolist()
+
+    performance_pivot = df[df['product_category_name'].isin(top_categories_ibitinga)].groupby(
+        ['product_category_name', 'is_ibitinga']
+    ).agg({
+        'order_id': 'count',
+        'price': 'sum',
+        'profit_margin': 'sum',
+        'profit_margin_pct': 'mean',
+        'seller_id': 'nunique'
+    }).unstack('is_ibitinga')
+
+    performance_comparison = pd.DataFrame(index=performance_pivot.index)
+    for metric in ['order_id', 'price', 'profit_margin', 'profit_margin_pct', 'seller_id']:
+        if (metric, True) in performance_pivot.columns and (metric, False) in performance_pivot.columns:
+            performance_comparison[f'{metric}_ibitinga'] = performance_pivot[(metric, True)]
+            performance_comparison[f'{metric}_other'] = performance_pivot[(metric, False)]
+            performance_comparison[f'{metric}_pct_diff'] = (
+                (performance_pivot[(metric, True)] - performance_pivot[(metric, False)]) /
+                performance_pivot[(metric, False)] * 100
+            )
+
+    if 'price_ibitinga' in performance_comparison.columns:
+        performance_comparison['sales_per_seller_ibitinga'] = (
+            performance_comparison['price_ibitinga'] / performance_comparison['seller_id_ibitinga']
+        )
+        performance_comparison['sales_per_seller_other'] = (
+            performance_comparison['price_other'] / performance_comparison['seller_id_other']
+        )
+        performance_comparison['sales_per_seller_pct_diff'] = (
+            (performance_comparison['sales_per_seller_ibitinga'] - performance_comparison['sales_per_seller_other']) /
+            performance_comparison['sales_per_seller_other'] * 100
+        )
+
+    return {
+        'period': (six_months_ago, last_date),
+        'ibitinga_sellers': df[df['is_ibitinga']]['seller_id'].nunique(),
+        'other_sellers': df[~df['is_ibitinga']]['seller_id'].nunique(),
+        'top_categories': top_categories_ibitinga,
+        'performance_comparison': performance_comparison,
+    }
+
+
+@task('orders_items_products_sellers', 'customers', 'order_payments', 'order_reviews', 'product_categories')
+def main_data(orders_items_products_sellers_df, customers_df, order_payments_df, order_reviews_df, product_categories_df):
+    # Dataset gabungan untuk dashboard (dashboard/main_data.csv)
+    main_df = orders_items_products_sellers_df.merge(
+        customers_df[['customer_id', 'customer_unique_id', 'customer_state', 'customer_city']],
+        on='customer_id',
+        how='inner'
+    ).merge(
+        order_payments_df,
+        on='order_id',
+        how='inner'
+    ).merge(
+        order_reviews_df[['order_id', 'review_score', 'review_creation_date']],
+        on='order_id',
+        how='left'
+    ).merge(
+        product_categories_df[['product_category_name', 'product_category_name_english']],
+        on='product_category_name',
+        how='left'
+    )
+
+    # Kolom turunan yang berguna untuk analisis
+    main_df['year'] = main_df['order_purchase_timestamp'].dt.year
+    main_df['month'] = main_df['order_purchase_timestamp'].dt.month
+    main_df['year_month'] = main_df['order_purchase_timestamp'].dt.strftime('%Y-%m')
+    main_df['quarter'] = main_df['order_purchase_timestamp'].dt.quarter
+    main_df['year_quarter'] = main_df['year'].astype(str) + '-Q' + main_df['quarter'].astype(str)
+
+    main_df['is_ibitinga'] = main_df['seller_city'] == 'ibitinga'
+
+    main_df['profit_margin'] = main_df['price'] - main_df['freight_value']
+    main_df['profit_margin_pct'] = (main_df['profit_margin'] / main_df['price']) * 100
+
+    main_df['photo_category'] = pd.cut(
+        main_df['product_photos_qty'],
+        bins=[0, 1, 3, float('inf')],
+        labels=['Foto Tunggal', '2-3 Foto', '>3 Foto'],
+        right=True
+    )
+    main_df['installment_category'] = pd.cut(
+        main_df['payment_installments'],
+        bins=INSTALLMENT_BINS,
+        labels=INSTALLMENT_LABELS,
+        right=True
+    )
+
+    delivered = main_df['order_delivered_customer_date'].notna()
+    has_estimate = delivered & main_df['order_estimated_delivery_date'].notna()
+    main_df['is_late_delivery'] = np.where(
+        has_estimate,
+        main_df['order_delivered_customer_date'] > main_df['order_estimated_delivery_date'],
+        np.nan
+    )
+    main_df['delivery_delay_days'] = np.where(
+        has_estimate,
+        (main_df['order_delivered_customer_date'] - main_df['order_estimated_delivery_date']).dt.days,
+        np.nan
+    )
+    main_df['shipping_duration_days'] = np.where(
+        delivered,
+        (main_df['order_delivered_customer_date'] - main_df['order_purchase_timestamp']).dt.days,
+        np.nan
+    )
+
+    main_df['photo_analysis_flag'] = 1
+    main_df['installment_analysis_flag'] = 1
+    main_df['delivery_analysis_flag'] = delivered
+    main_df['ibitinga_analysis_flag'] = main_df['product_category_name'].isin(
+        main_df[main_df['is_ibitinga']].groupby('product_category_name')['price'].sum().nlargest(10).index
+    )
+
+    return main_df
+
+
+ANALYSES = [
+    'photo_conversion',
+    'late_delivery_reviews',
+    'state_quarterly_trends',
+    'installment_revenue',
+    'ibitinga_cluster',
+    'main_data',
+]
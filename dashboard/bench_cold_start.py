@@ -0,0 +1,69 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import data_cache
+
+DASHBOARD_PATH = 'dashboard/dashboard.py'
+
+# Skrip yang dijalankan di proses baru: render halaman pertama dashboard secara headless
+RENDER_SCRIPT = """
+import sys
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2]))
+at.run()
+if at.exception:
+    print(at.exception[0].message, file=sys.stderr)
+    sys.exit(1)
+"""
+
+
+def run_once(dashboard_path, timeout):
+    # Ukur waktu dari proses dimulai hingga halaman pertama selesai dirender
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', RENDER_SCRIPT, os.path.abspath(dashboard_path), str(timeout)],
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Render gagal: {result.stderr.strip()}")
+    return elapsed
+
+
+def benchmark(runs=5, cold=False, dashboard_path=DASHBOARD_PATH, cache_dir=data_cache.CACHE_DIR, timeout=120):
+    timings = []
+    for _ in range(runs):
+        if cold:
+            # Simulasikan container yang baru dibuat tanpa hasil warm-up
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        timings.append(run_once(dashboard_path, timeout))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start dashboard (proses dimulai -> halaman pertama dirender)")
+    parser.add_argument('--runs', type=int, default=5, help="Jumlah pengulangan")
+    parser.add_argument('--cold', action='store_true', help="Hapus cache sebelum setiap run (tanpa warm-up)")
+    parser.add_argument('--timeout', type=float, default=120, help="Batas waktu render per run (detik)")
+    args = parser.parse_args()
+
+    timings = benchmark(runs=args.runs, cold=args.cold, timeout=args.timeout)
+
+    mode = "tanpa warm-up" if args.cold else "dengan cache yang ada"
+    print(f"Cold start dashboard ({mode}, {args.runs} run):")
+    print(f"  median: {statistics.median(timings):.2f} detik")
+    print(f"  min:    {min(timings):.2f} detik")
+    print(f"  max:    {max(timings):.2f} detik")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+# Kolom yang bisa dipakai sebagai filter silang beserta label di sidebar
+FILTER_COLUMNS = {
+    'customer_state': "Negara Bagian Pelanggan",
+    'seller_state': "Negara Bagian Penjual",
+    'seller_city': "Kota Penjual",
+    'product_category_name': "Kategori Produk",
+    'payment_type': "Tipe Pembayaran",
+    'order_status': "Status Pesanan",
+    'review_score': "Skor Ulasan",
+}
+
+
+def build_bitmap_index(df, columns=FILTER_COLUMNS):
+    # Untuk setiap nilai unik di setiap kolom, simpan bitset posisi baris
+    # (1 bit per baris, dipadatkan dengan np.packbits)
+    n_rows = len(df)
+    index = {'n_rows': n_rows, 'columns': {}}
+
+    for col in columns:
+        if col not in df.columns:
+            continue
+
+        codes, values = pd.factorize(df[col], sort=True)
+
+        # Urutkan posisi baris berdasarkan kode nilai sekali saja, lalu potong per nilai.
+        # NaN mendapat kode -1 sehingga berada di awal urutan dan tidak diindeks.
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+
+        bitmaps = np.zeros((len(values), (n_rows + 7) // 8), dtype=np.uint8)
+        row_bits = np.zeros(n_rows, dtype=bool)
+        for i in range(len(values)):
+            rows = order[bounds[i]:bounds[i + 1]]
+            row_bits[rows] = True
+            bitmaps[i] = np.packbits(row_bits)
+            row_bits[rows] = False
+
+        index['columns'][col] = {
+            'values': values.tolist(),
+            'positions': {value: i for i, value in enumerate(values.tolist())},
+            'bitmaps': bitmaps,
+        }
+
+    return index
+
+
+def filter_options(index, col):
+    if col not in index['columns']:
+        return []
+    return index['columns'][col]['values']
+
+
+def select_rows(index, selections):
+    # selections: {kolom: [nilai, ...]}. Nilai dalam satu kolom digabung dengan OR,
+    # antar kolom digabung dengan AND. Kembalikan None jika tidak ada filter aktif.
+    selected = None
+
+    for col, values in selections.items():
+        if not values or col not in index['columns']:
+            continue
+
+        entry = index['columns'][col]
+        rows = [entry['positions'][value] for value in values if value in entry['positions']]
+        if rows:
+            col_bits = np.bitwise_or.reduce(entry['bitmaps'][rows], axis=0)
+        else:
+            col_bits = np.zeros(entry['bitmaps'].shape[1], dtype=np.uint8)
+
+        selected = col_bits if selected is None else np.bitwise_and(selected, col_bits)
+
+    return selected
+
+
+def bitmap_to_mask(bits, n_rows):
+    return np.unpackbits(bits, count=n_rows).astype(bool)
+
+
+def build_date_index(ts):
+    # Posisi baris diurutkan berdasarkan timestamp (NaT dibuang), sehingga rentang
+    # tanggal cukup dipotong dengan searchsorted tanpa membandingkan seluruh kolom
+    valid = np.flatnonzero(ts.notna().to_numpy())
+    values = ts.to_numpy(dtype='datetime64[ns]')[valid]
+    order = np.argsort(values, kind='stable')
+    return {'n_rows': len(ts), 'rows': valid[order], 'values': values[order]}
+
+
+def date_range_mask(date_index, start_date, end_date):
+    # Baris dengan start_date <= tanggal <= end_date (kedua ujung inklusif, per hari)
+    values = date_index['values']
+    lo = np.searchsorted(values, pd.Timestamp(start_date).to_datetime64(), side='left')
+    hi = np.searchsorted(values, (pd.Timestamp(end_date) + pd.Timedelta(days=1)).to_datetime64(), side='left')
+    mask = np.zeros(date_index['n_rows'], dtype=bool)
+    mask[date_index['rows'][lo:hi]] = True
+    return mask
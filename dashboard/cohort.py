@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+import data_cache
+
+ORDER_COLUMNS = ['customer_unique_id', 'order_id', 'order_purchase_timestamp']
+
+
+def empty_state():
+    return {
+        # Bulan terakhir (indeks tahun * 12 + bulan - 1) yang sudah diproses
+        'last_month': None,
+        # Per customer_unique_id: bulan pembelian pertama, pembelian terakhir, jumlah pesanan
+        'customers': pd.DataFrame({
+            'first_month': pd.Series(dtype='int64'),
+            'last_purchase': pd.Series(dtype='datetime64[ns]'),
+            'n_orders': pd.Series(dtype='int64'),
+        }),
+        # Matriks kohort x umur (bulan sejak pembelian pertama): jumlah pelanggan aktif
+        'matrix': pd.DataFrame(dtype='int64'),
+        # Jarak antar pembelian (hari) untuk pelanggan yang membeli ulang
+        'gap_days': np.array([], dtype='float64'),
+        # Sidik jari per bulan yang sudah diserap: bulan -> (jumlah pesanan, hash isi)
+        'month_fingerprints': {},
+    }
+
+
+def month_index(ts):
+    return (ts.dt.year * 12 + ts.dt.month - 1).to_numpy(dtype='int64')
+
+
+def month_label(index):
+    return f"{index // 12}-{index % 12 + 1:02d}"
+
+
+def order_events(df):
+    # Data utama berisi satu baris per item x pembayaran, ambil satu baris per pesanan
+    events = df[ORDER_COLUMNS].dropna().drop_duplicates('order_id')
+    return events
+
+
+def month_fingerprints(events):
+    # Jumlah pesanan dan hash isi per bulan. Hash per baris dijumlahkan (modulo 2^64)
+    # sehingga tidak bergantung pada urutan baris di CSV.
+    months = month_index(events['order_purchase_timestamp'])
+    row_hashes = pd.util.hash_pandas_object(events[ORDER_COLUMNS], index=False).to_numpy()
+    grouped = pd.DataFrame({'month': months, 'hash': row_hashes}).groupby('month')['hash']
+    counts = grouped.size()
+    digests = grouped.agg(lambda h: int(np.sum(h.to_numpy(), dtype='uint64')))
+    return {int(m): (int(counts[m]), int(digests[m])) for m in counts.index}
+
+
+def matches_source(state, events):
+    # State hanya boleh dipakai ulang jika bulan-bulan yang sudah diserap
+    # masih identik dengan data sekarang
+    if state['last_month'] is None:
+        return True
+    stored = state.get('month_fingerprints')
+    if stored is None:
+        return False
+    current = month_fingerprints(events)
+    current = {m: fp for m, fp in current.items() if m <= state['last_month']}
+    return current == stored
+
+
+def update_cohorts(state, df, until_month=None):
+    # Tambahkan pesanan pada bulan setelah state['last_month'] (hingga until_month)
+    # ke dalam state. State lama tidak diubah, hasilnya state baru.
+    events = order_events(df)
+    months = month_index(events['order_purchase_timestamp'])
+
+    keep = np.ones(len(events), dtype=bool)
+    if state['last_month'] is not None:
+        keep &= months > state['last_month']
+    if until_month is not None:
+        keep &= months <= until_month
+    if not keep.any():
+        return state
+
+    fingerprints = dict(state['month_fingerprints'])
+    fingerprints.update(month_fingerprints(events[keep]))
+
+    # Urutkan sekali berdasarkan (customer_unique_id, order_purchase_timestamp)
+    events = events[keep].sort_values(['customer_unique_id', 'order_purchase_timestamp'], kind='stable')
+    uids = events['customer_unique_id'].to_numpy()
+    ts = events['order_purchase_timestamp'].to_numpy(dtype='datetime64[ns]')
+    months = month_index(events['order_purchase_timestamp'])
+
+    # Segmen = rangkaian baris milik pelanggan yang sama
+    is_start = np.r_[True, uids[1:] != uids[:-1]]
+    starts = np.flatnonzero(is_start)
+    segment = np.cumsum(is_start) - 1
+    segment_uids = uids[starts]
+
+    # Gabungkan dengan riwayat pelanggan yang sudah ada di state
+    prior = state['customers'].reindex(segment_uids)
+    is_new = prior['first_month'].isna().to_numpy()
+    first_month = np.where(is_new, months[starts], prior['first_month'].fillna(0).to_numpy(dtype='int64'))
+    ages = months - first_month[segment]
+
+    # Jarak antar pembelian: selisih dengan baris sebelumnya dalam segmen yang sama,
+    # atau dengan pembelian terakhir dari state untuk baris pertama segmen
+    previous = np.empty_like(ts)
+    previous[1:] = ts[:-1]
+    previous[starts] = prior['last_purchase'].to_numpy(dtype='datetime64[ns]')
+    has_previous = ~np.isnat(previous)
+    gap_days = (ts[has_previous] - previous[has_previous]) / np.timedelta64(1, 'D')
+
+    # Pelanggan dihitung sekali per bulan: ambil baris pertama setiap (pelanggan, bulan)
+    first_in_month = is_start | np.r_[True, months[1:] != months[:-1]]
+    active = pd.DataFrame({
+        'cohort': first_month[segment][first_in_month],
+        'age': ages[first_in_month],
+    })
+    increment = active.groupby(['cohort', 'age']).size().unstack('age', fill_value=0)
+    matrix = state['matrix'].add(increment, fill_value=0).fillna(0).astype('int64')
+    matrix = matrix.sort_index().sort_index(axis=1)
+
+    # Perbarui ringkasan per pelanggan
+    ends = np.r_[starts[1:], len(ts)] - 1
+    updated = pd.DataFrame({
+        'first_month': first_month,
+        'last_purchase': ts[ends],
+        'n_orders': prior['n_orders'].fillna(0).to_numpy(dtype='int64') + np.diff(np.r_[starts, len(ts)]),
+    }, index=segment_uids)
+    customers = pd.concat([state['customers'].drop(segment_uids[~is_new]), updated])
+
+    return {
+        'last_month': int(months.max()),
+        'customers': customers,
+        'matrix': matrix,
+        'gap_days': np.concatenate([state['gap_days'], gap_days]),
+        'month_fingerprints': fingerprints,
+    }
+
+
+def build_cohorts(df, state=None):
+    # Bulan terakhir dalam data bisa jadi belum lengkap, sehingga hanya bulan yang
+    # sudah selesai yang disimpan ke state. Bulan berjalan ditambahkan ke tampilan saja.
+    state = state or empty_state()
+    events = order_events(df)
+    if events.empty:
+        return state, state
+
+    latest_month = int(month_index(events['order_purchase_timestamp']).max())
+    closed = update_cohorts(state, events, until_month=latest_month - 1)
+    view = update_cohorts(closed, events)
+    return closed, view
+
+
+def refresh_cohorts(df, cache_dir=data_cache.CACHE_DIR, rebuild=False):
+    # Muat state dari cache lalu tambahkan hanya bulan-bulan baru dari data
+    state = None if rebuild else data_cache.read_cache('cohort_state', None, cache_dir)
+    events = order_events(df)
+    if state is not None and not matches_source(state, events):
+        # Bulan yang sudah diserap berubah (data dikoreksi atau diganti), hitung ulang
+        state = None
+
+    closed, view = build_cohorts(events, state)
+    if closed is not state:
+        try:
+            data_cache.write_cache('cohort_state', closed, cache_dir)
+        except OSError:
+            pass
+    return view
+
+
+def retention_table(state):
+    # Persentase pelanggan kohort yang aktif kembali pada umur tertentu
+    matrix = state['matrix']
+    if matrix.empty:
+        return matrix
+    retention = matrix.div(matrix[0], axis=0) * 100
+    # Sel yang belum bisa diamati (kohort + umur melewati bulan terakhir) dikosongkan
+    observable = np.add.outer(retention.index.to_numpy(), retention.columns.to_numpy()) <= state['last_month']
+    retention = retention.where(observable)
+    retention.index = [month_label(i) for i in retention.index]
+    return retention
+
+
+def repeat_summary(state):
+    customers = state['customers']
+    gaps = state['gap_days']
+    total = len(customers)
+    repeat = int((customers['n_orders'] > 1).sum())
+    return {
+        'customers': total,
+        'repeat_customers': repeat,
+        'repeat_rate': repeat / total * 100 if total > 0 else 0,
+        'median_gap_days': float(np.median(gaps)) if len(gaps) > 0 else None,
+    }
@@ -1,13 +1,11 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-from babel.numbers import format_currency
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from data_cache import load_main_data, load_or_build
+from bitmap_index import FILTER_COLUMNS, build_bitmap_index, filter_options, select_rows, bitmap_to_mask, build_date_index, date_range_mask
+from cohort import refresh_cohorts, retention_table, repeat_summary
 
 # Set konfigurasi halaman
 st.set_page_config(
@@ -39,41 +37,45 @@ st.title("🇧🇷 Dashboard Analisis E-commerce Brasil")
 st.markdown("#### Wawasan dan Metrik Kinerja dari Data E-commerce (2017-2018)")
 
 # Memuat Data
-@st.cache_data
+# cache_resource menyimpan satu DataFrame bersama per proses (tanpa pickle ulang
+# setiap rerun). Halaman tidak boleh memodifikasi all_df secara langsung.
+@st.cache_resource
 def load_data():
     try:
-        df = pd.read_csv('dashboard/main_data.csv')
-        
-        # Konversi kolom tanggal ke format datetime
-        date_columns = [col for col in df.columns if 'date' in col or 'timestamp' in col]
-        for col in date_columns:
-            if col in df.columns:
-                try:
-                    # Untuk tanggal dengan format "YYYY-MM-DD HH:MM:SS"
-                    df[col] = pd.to_datetime(df[col], format='%Y-%m-%d %H:%M:%S', errors='coerce')
-                except:
-                    try:
-                        # Jika format spesifik gagal, gunakan pendekatan yang lebih fleksibel
-                        df[col] = pd.to_datetime(df[col], errors='coerce')
-                    except Exception as e:
-                        st.warning(f"Tidak dapat mengonversi kolom {col} ke format datetime: {e}")
-        
-        # Pastikan kolom year_month ada untuk analisis waktu
-        if 'year_month' not in df.columns and 'order_purchase_timestamp' in df.columns:
-            df['year_month'] = df['order_purchase_timestamp'].dt.strftime('%Y-%m')
-        
-        return df
+        # Memakai cache hasil warm-up (dashboard/warmup.py) jika tersedia
+        return load_main_data()
     except Exception as e:
         st.error(f"Error memuat data: {e}")
         # Kembalikan dataframe kosong atau raiser error
         return pd.DataFrame()
 
+# Indeks bitmap per nilai untuk filter silang, dibangun sekali per proses
+@st.cache_resource
+def load_bitmap_index(_df):
+    index = load_or_build('bitmap_index', lambda: build_bitmap_index(_df))
+    if index['n_rows'] != len(_df):
+        # Cache indeks tidak cocok dengan data yang dimuat, bangun ulang
+        index = build_bitmap_index(_df)
+    return index
+
+# Posisi baris terurut per timestamp untuk filter tanggal, dibangun sekali per proses
+@st.cache_resource
+def load_date_index(_df):
+    return build_date_index(_df['order_purchase_timestamp'])
+
+# Matriks kohort diperbarui inkremental dari state yang tersimpan di cache
+@st.cache_resource
+def load_cohorts(_df):
+    return refresh_cohorts(_df)
+
 all_df = load_data()
 
 if all_df.empty:
     st.error("Gagal memuat data. Mohon periksa apakah 'main_data.csv' ada dan diformat dengan benar.")
     st.stop()
 
+bitmap_index = load_bitmap_index(all_df)
+
 # Membuat filter tanggal
 st.sidebar.header("📅 Filter Tanggal")
 
@@ -94,12 +96,27 @@ else:
     start_date = datetime(2017, 1, 1).date()
     end_date = datetime(2018, 12, 31).date()
 
+# Membuat filter silang
+st.sidebar.header("🔎 Filter Silang")
+selections = {}
+for col, label in FILTER_COLUMNS.items():
+    options = filter_options(bitmap_index, col)
+    if options:
+        selections[col] = st.sidebar.multiselect(label, options)
+
 # Filter data berdasarkan tanggal yang dipilih
 if 'order_purchase_timestamp' in all_df.columns:
-    filtered_df = all_df[(all_df['order_purchase_timestamp'].dt.date >= start_date) & 
-                         (all_df['order_purchase_timestamp'].dt.date <= end_date)]
+    # Rentang dipotong dari indeks tanggal terurut (searchsorted), bukan perbandingan per baris
+    row_mask = date_range_mask(load_date_index(all_df), start_date, end_date)
 else:
-    filtered_df = all_df
+    row_mask = np.ones(len(all_df), dtype=bool)
+
+# Gabungkan dengan filter silang melalui operasi AND/OR pada bitmap
+selected_bits = select_rows(bitmap_index, selections)
+if selected_bits is not None:
+    row_mask = row_mask & bitmap_to_mask(selected_bits, bitmap_index['n_rows'])
+
+filtered_df = all_df[row_mask]
 
 # Membuat navigasi di sidebar
 st.sidebar.header("📊 Navigasi")
@@ -108,7 +125,8 @@ analysis_options = [
     "Analisis Foto Produk",
     "Analisis Cicilan Pembayaran",
     "Analisis Kinerja Pengiriman",
-    "Analisis Klaster Ibitinga"
+    "Analisis Klaster Ibitinga",
+    "Analisis Kohort Pelanggan"
 ]
 selected_analysis = st.sidebar.radio("Pilih Analisis:", analysis_options)
 
@@ -116,6 +134,10 @@ selected_analysis = st.sidebar.radio("Pilih Analisis:", analysis_options)
 def format_brl(value):
     return f"R$ {value:,.2f}"
 
+# Membuat fungsi untuk format skor ulasan (tanda '-' jika tidak ada data)
+def format_score(value):
+    return f"{value:.2f}/5,00" if pd.notnull(value) else "-"
+
 # Membuat fungsi utilitas untuk visualisasi yang lebih baik
 def plot_bar_chart(df, x, y, title, xlabel, ylabel, color='#1E88E5', orientation='v'):
     fig = px.bar(
@@ -144,6 +166,9 @@ def metric_card(title, value, delta=None, suffix="", prefix=""):
 def subheader(text):
     st.markdown(f"### {text}")
 
+# Plotly baru diimpor setelah sidebar dirender, karena dipakai oleh semua halaman
+import plotly.express as px
+
 # 1. BAGIAN IKHTISAR
 if selected_analysis == "Ikhtisar":
     subheader("📈 Ikhtisar Bisnis")
@@ -431,104 +456,111 @@ elif selected_analysis == "Analisis Kinerja Pengiriman":
         # Filter data
         delivery_df = filtered_df.dropna(subset=['is_late_delivery', 'review_score'])
         
-        # Konversi boolean ke kategori jika diperlukan
-        if delivery_df['is_late_delivery'].dtype == bool:
-            delivery_df['delivery_status'] = delivery_df['is_late_delivery'].map({True: 'Terlambat', False: 'Tepat Waktu'})
+        if delivery_df.empty:
+            st.warning("Tidak ada data pengiriman untuk filter yang dipilih")
         else:
-            delivery_df['delivery_status'] = delivery_df['is_late_delivery'].map({1: 'Terlambat', 0: 'Tepat Waktu'})
-        
-        # Skor ulasan rata-rata berdasarkan status pengiriman
-        review_by_delivery = delivery_df.groupby('delivery_status')['review_score'].mean().reset_index()
-        
-        # Hitung persentase pengiriman terlambat
-        total_deliveries = len(delivery_df)
-        late_deliveries = len(delivery_df[delivery_df['delivery_status'] == 'Terlambat'])
-        late_percentage = (late_deliveries / total_deliveries) * 100 if total_deliveries > 0 else 0
-        
-        # Buat metrik di bagian atas
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-            st.metric("Skor Ulasan Rata-rata (Tepat Waktu)", f"{review_by_delivery[review_by_delivery['delivery_status'] == 'Tepat Waktu']['review_score'].values[0]:.2f}/5,00")
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-            st.metric("Skor Ulasan Rata-rata (Terlambat)", f"{review_by_delivery[review_by_delivery['delivery_status'] == 'Terlambat']['review_score'].values[0]:.2f}/5,00")
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-            st.metric("Persentase Pengiriman Terlambat", f"{late_percentage:.2f}%")
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Perbandingan skor ulasan
-            fig_review = px.bar(
-                review_by_delivery,
-                x='delivery_status',
-                y='review_score',
-                title='Skor Ulasan Rata-rata berdasarkan Status Pengiriman',
-                labels={'delivery_status': 'Status Pengiriman', 'review_score': 'Skor Ulasan Rata-rata'},
-                color='delivery_status',
-                color_discrete_map={'Tepat Waktu': '#4CAF50', 'Terlambat': '#F44336'}
-            )
-            st.plotly_chart(fig_review, use_container_width=True)
-        
-        with col2:
-            # Distribusi skor ulasan
-            review_dist = delivery_df.groupby(['delivery_status', 'review_score']).size().reset_index(name='count')
-            review_totals = review_dist.groupby('delivery_status')['count'].sum().reset_index(name='total')
-            review_dist = review_dist.merge(review_totals, on='delivery_status')
-            review_dist['percentage'] = (review_dist['count'] / review_dist['total']) * 100
+            # Konversi boolean ke kategori jika diperlukan
+            if delivery_df['is_late_delivery'].dtype == bool:
+                delivery_df['delivery_status'] = delivery_df['is_late_delivery'].map({True: 'Terlambat', False: 'Tepat Waktu'})
+            else:
+                delivery_df['delivery_status'] = delivery_df['is_late_delivery'].map({1: 'Terlambat', 0: 'Tepat Waktu'})
+        
+            # Skor ulasan rata-rata berdasarkan status pengiriman
+            review_by_delivery = delivery_df.groupby('delivery_status')['review_score'].mean().reset_index()
+            avg_review = review_by_delivery.set_index('delivery_status')['review_score']
+        
+            # Hitung persentase pengiriman terlambat
+            total_deliveries = len(delivery_df)
+            late_deliveries = len(delivery_df[delivery_df['delivery_status'] == 'Terlambat'])
+            late_percentage = (late_deliveries / total_deliveries) * 100 if total_deliveries > 0 else 0
+        
+            # Buat metrik di bagian atas
+            col1, col2, col3 = st.columns(3)
+        
+            with col1:
+                st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+                st.metric("Skor Ulasan Rata-rata (Tepat Waktu)", format_score(avg_review.get('Tepat Waktu')))
+                st.markdown("</div>", unsafe_allow_html=True)
+        
+            with col2:
+                st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+                st.metric("Skor Ulasan Rata-rata (Terlambat)", format_score(avg_review.get('Terlambat')))
+                st.markdown("</div>", unsafe_allow_html=True)
+        
+            with col3:
+                st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+                st.metric("Persentase Pengiriman Terlambat", f"{late_percentage:.2f}%")
+                st.markdown("</div>", unsafe_allow_html=True)
+        
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Perbandingan skor ulasan
+                fig_review = px.bar(
+                    review_by_delivery,
+                    x='delivery_status',
+                    y='review_score',
+                    title='Skor Ulasan Rata-rata berdasarkan Status Pengiriman',
+                    labels={'delivery_status': 'Status Pengiriman', 'review_score': 'Skor Ulasan Rata-rata'},
+                    color='delivery_status',
+                    color_discrete_map={'Tepat Waktu': '#4CAF50', 'Terlambat': '#F44336'}
+                )
+                st.plotly_chart(fig_review, use_container_width=True)
+        
+            with col2:
+                # Distribusi skor ulasan
+                review_dist = delivery_df.groupby(['delivery_status', 'review_score']).size().reset_index(name='count')
+                review_totals = review_dist.groupby('delivery_status')['count'].sum().reset_index(name='total')
+                review_dist = review_dist.merge(review_totals, on='delivery_status')
+                review_dist['percentage'] = (review_dist['count'] / review_dist['total']) * 100
             
-            fig_dist = px.bar(
-                review_dist,
-                x='review_score',
-                y='percentage',
-                color='delivery_status',
-                barmode='group',
-                title='Distribusi Skor Ulasan berdasarkan Status Pengiriman',
-                labels={'review_score': 'Skor Ulasan', 'percentage': 'Persentase Ulasan (%)', 'delivery_status': 'Status Pengiriman'},
-                color_discrete_map={'Tepat Waktu': '#4CAF50', 'Terlambat': '#F44336'}
-            )
-            st.plotly_chart(fig_dist, use_container_width=True)
+                fig_dist = px.bar(
+                    review_dist,
+                    x='review_score',
+                    y='percentage',
+                    color='delivery_status',
+                    barmode='group',
+                    title='Distribusi Skor Ulasan berdasarkan Status Pengiriman',
+                    labels={'review_score': 'Skor Ulasan', 'percentage': 'Persentase Ulasan (%)', 'delivery_status': 'Status Pengiriman'},
+                    color_discrete_map={'Tepat Waktu': '#4CAF50', 'Terlambat': '#F44336'}
+                )
+                st.plotly_chart(fig_dist, use_container_width=True)
         
-        # Kategori yang paling terdampak oleh pengiriman terlambat
-        if 'product_category_name' in delivery_df.columns:
-            st.markdown("### Kategori yang Paling Terdampak oleh Pengiriman Terlambat")
+            # Kategori yang paling terdampak oleh pengiriman terlambat
+            if 'product_category_name' in delivery_df.columns:
+                st.markdown("### Kategori yang Paling Terdampak oleh Pengiriman Terlambat")
             
-            # Hitung dampak pada ulasan berdasarkan kategori
-            category_impact = delivery_df.groupby(['product_category_name', 'delivery_status'])['review_score'].mean().reset_index()
+                # Hitung dampak pada ulasan berdasarkan kategori
+                category_impact = delivery_df.groupby(['product_category_name', 'delivery_status'])['review_score'].mean().reset_index()
             
-            # Pivot untuk membandingkan tepat waktu vs terlambat
-            impact_pivot = category_impact.pivot(
-                index='product_category_name',
-                columns='delivery_status',
-                values='review_score'
-            ).reset_index()
+                # Pivot untuk membandingkan tepat waktu vs terlambat
+                impact_pivot = category_impact.pivot(
+                    index='product_category_name',
+                    columns='delivery_status',
+                    values='review_score'
+                ).reset_index()
             
-            # Hitung penurunan skor ulasan
-            impact_pivot['score_decrease'] = impact_pivot['Tepat Waktu'] - impact_pivot['Terlambat']
-            impact_pivot['score_decrease_pct'] = (impact_pivot['score_decrease'] / impact_pivot['Tepat Waktu']) * 100
-            impact_pivot = impact_pivot.dropna(subset=['score_decrease_pct']).sort_values('score_decrease_pct', ascending=False)
+                # Hitung penurunan skor ulasan (hanya jika kedua status pengiriman ada)
+                if 'Tepat Waktu' in impact_pivot.columns and 'Terlambat' in impact_pivot.columns:
+                    impact_pivot['score_decrease'] = impact_pivot['Tepat Waktu'] - impact_pivot['Terlambat']
+                    impact_pivot['score_decrease_pct'] = (impact_pivot['score_decrease'] / impact_pivot['Tepat Waktu']) * 100
+                    impact_pivot = impact_pivot.dropna(subset=['score_decrease_pct']).sort_values('score_decrease_pct', ascending=False)
             
-            top_impact = impact_pivot.head(10)
+                    top_impact = impact_pivot.head(10)
             
-            fig_impact = px.bar(
-                top_impact,
-                x='product_category_name',
-                y='score_decrease_pct',
-                title='10 Kategori yang Paling Terdampak oleh Pengiriman Terlambat (% Penurunan Skor Ulasan)',
-                labels={'product_category_name': 'Kategori Produk', 'score_decrease_pct': 'Penurunan Skor Ulasan (%)'},
-                color='score_decrease_pct',
-                color_continuous_scale='Reds'
-            )
-            fig_impact.update_layout(xaxis={'categoryorder':'total descending'})
-            st.plotly_chart(fig_impact, use_container_width=True)
+                    fig_impact = px.bar(
+                        top_impact,
+                        x='product_category_name',
+                        y='score_decrease_pct',
+                        title='10 Kategori yang Paling Terdampak oleh Pengiriman Terlambat (% Penurunan Skor Ulasan)',
+                        labels={'product_category_name': 'Kategori Produk', 'score_decrease_pct': 'Penurunan Skor Ulasan (%)'},
+                        color='score_decrease_pct',
+                        color_continuous_scale='Reds'
+                    )
+                    fig_impact.update_layout(xaxis={'categoryorder':'total descending'})
+                    st.plotly_chart(fig_impact, use_container_width=True)
+                else:
+                    st.warning("Data tidak cukup untuk membandingkan pengiriman tepat waktu dan terlambat")
     else:
         st.error("Data yang diperlukan untuk analisis kinerja pengiriman tidak tersedia dalam dataset.")
 
@@ -539,6 +571,10 @@ elif selected_analysis == "Analisis Klaster Ibitinga":
     Analisis ini mengkaji kinerja penjual dari Ibitinga dibandingkan dengan penjual dari kota-kota lain.
     """)
     
+    # Modul subplot hanya dibutuhkan oleh halaman ini
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
     # Periksa apakah analisis Ibitinga dimungkinkan
     if 'is_ibitinga' in filtered_df.columns and 'price' in filtered_df.columns:
         # Filter data
@@ -576,8 +612,10 @@ elif selected_analysis == "Analisis Klaster Ibitinga":
             st.metric("Pendapatan per Penjual (Kota Lain)", format_brl(revenue_per_seller_other))
             st.markdown("</div>", unsafe_allow_html=True)
         
-        # Analisis per kategori
-        if 'product_category_name' in ibitinga_df.columns:
+        # Analisis per kategori (perbandingan butuh penjual Ibitinga dan kota lain sekaligus)
+        if 'product_category_name' in ibitinga_df.columns and (ibitinga_sellers == 0 or other_sellers == 0):
+            st.warning("Data tidak cukup untuk membandingkan penjual Ibitinga dengan kota lain")
+        elif 'product_category_name' in ibitinga_df.columns:
             # Dapatkan kategori teratas untuk Ibitinga
             ibitinga_categories = ibitinga_df[ibitinga_df['is_ibitinga']].groupby('product_category_name')['price'].sum().nlargest(10).index.tolist()
             
@@ -605,13 +643,14 @@ elif selected_analysis == "Analisis Klaster Ibitinga":
             performance_pivot.columns = [f"{col[0]}_{col[1]}" for col in performance_pivot.columns]
             performance_pivot = performance_pivot.reset_index()
             
-            # Hitung perbedaan persentase
-            performance_pivot['revenue_per_seller_pct_diff'] = (
-                (performance_pivot['revenue_per_seller_True'] - performance_pivot['revenue_per_seller_False']) / 
-                performance_pivot['revenue_per_seller_False'] * 100
-            )
-            
-            performance_pivot = performance_pivot.sort_values('revenue_per_seller_pct_diff', ascending=False)
+            # Hitung perbedaan persentase (salah satu jenis penjual bisa tidak ada karena filter)
+            if 'revenue_per_seller_True' in performance_pivot.columns and 'revenue_per_seller_False' in performance_pivot.columns:
+                performance_pivot['revenue_per_seller_pct_diff'] = (
+                    (performance_pivot['revenue_per_seller_True'] - performance_pivot['revenue_per_seller_False']) / 
+                    performance_pivot['revenue_per_seller_False'] * 100
+                )
+                
+                performance_pivot = performance_pivot.sort_values('revenue_per_seller_pct_diff', ascending=False)
             
             # Buat visualisasi perbandingan
             st.markdown("### Pendapatan per Penjual: Ibitinga vs Kota Lain (Kategori Teratas)")
@@ -633,20 +672,23 @@ elif selected_analysis == "Analisis Klaster Ibitinga":
                         }
                     ])
             
-            comparison_df = pd.DataFrame(comparison_data)
+            if comparison_data:
+                comparison_df = pd.DataFrame(comparison_data)
             
-            fig_comparison = px.bar(
-                comparison_df,
-                x='Category',
-                y='Revenue per Seller',
-                color='Seller Type',
-                barmode='group',
-                title='Pendapatan per Penjual: Ibitinga vs Kota Lain (Kategori Teratas)',
-                labels={'Category': 'Kategori Produk', 'Revenue per Seller': 'Pendapatan per Penjual (R$)'},
-                color_discrete_map={'Ibitinga': '#1E88E5', 'Kota Lain': '#FFC107'}
-            )
-            fig_comparison.update_layout(xaxis={'categoryorder':'total descending'})
-            st.plotly_chart(fig_comparison, use_container_width=True)
+                fig_comparison = px.bar(
+                    comparison_df,
+                    x='Category',
+                    y='Revenue per Seller',
+                    color='Seller Type',
+                    barmode='group',
+                    title='Pendapatan per Penjual: Ibitinga vs Kota Lain (Kategori Teratas)',
+                    labels={'Category': 'Kategori Produk', 'Revenue per Seller': 'Pendapatan per Penjual (R$)'},
+                    color_discrete_map={'Ibitinga': '#1E88E5', 'Kota Lain': '#FFC107'}
+                )
+                fig_comparison.update_layout(xaxis={'categoryorder':'total descending'})
+                st.plotly_chart(fig_comparison, use_container_width=True)
+            else:
+                st.warning("Data tidak cukup untuk membandingkan penjual Ibitinga dengan kota lain")
             
             # Analisis detail kategori cama_mesa_banho (tempat tidur, mandi & meja)
             if 'cama_mesa_banho' in ibitinga_categories:
@@ -705,18 +747,19 @@ elif selected_analysis == "Analisis Klaster Ibitinga":
                     row=1, col=2
                 )
                 
-                # Tambahkan anotasi untuk subplot kedua
-                pct_diff = ((ibitinga_revenue_per_seller / other_revenue_per_seller) - 1) * 100
-                fig.add_annotation(
-                    x=0.5, y=ibitinga_revenue_per_seller * 1.1,
-                    text=f"{pct_diff:.1f}% lebih tinggi",
-                    showarrow=True,
-                    arrowhead=2,
-                    arrowsize=1,
-                    arrowcolor="green",
-                    ax=0, ay=-40,
-                    row=1, col=2
-                )
+                # Tambahkan anotasi untuk subplot kedua (hanya jika ada penjual kota lain)
+                if other_revenue_per_seller > 0:
+                    pct_diff = ((ibitinga_revenue_per_seller / other_revenue_per_seller) - 1) * 100
+                    fig.add_annotation(
+                        x=0.5, y=ibitinga_revenue_per_seller * 1.1,
+                        text=f"{pct_diff:.1f}% lebih tinggi",
+                        showarrow=True,
+                        arrowhead=2,
+                        arrowsize=1,
+                        arrowcolor="green",
+                        ax=0, ay=-40,
+                        row=1, col=2
+                    )
                 
                 # Perbarui tata letak
                 fig.update_layout(
@@ -735,6 +778,70 @@ elif selected_analysis == "Analisis Klaster Ibitinga":
                 - **Efisiensi**: Penjual Ibitinga menghasilkan pendapatan per penjual yang jauh lebih tinggi, menunjukkan kekuatan spesialisasi regional
                 """)
 
+# 6. ANALISIS KOHORT PELANGGAN
+elif selected_analysis == "Analisis Kohort Pelanggan":
+    subheader("🔁 Analisis Kohort Pelanggan")
+    st.markdown("""
+    Analisis ini mengukur retensi pelanggan (customer_unique_id) berdasarkan bulan pembelian pertama dan pembelian ulang.
+    Matriks kohort dihitung dari seluruh data, sehingga filter di sidebar tidak berlaku untuk halaman ini.
+    """)
+    
+    # Periksa apakah analisis kohort dimungkinkan
+    if 'customer_unique_id' in all_df.columns and 'order_purchase_timestamp' in all_df.columns:
+        cohorts = load_cohorts(all_df)
+        summary = repeat_summary(cohorts)
+        retention = retention_table(cohorts)
+        
+        # Tampilkan metrik
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            st.metric("Jumlah Pelanggan Unik", f"{summary['customers']:,}")
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            st.metric("Persentase Pelanggan Pembelian Ulang", f"{summary['repeat_rate']:.2f}%")
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            median_gap = summary['median_gap_days']
+            st.metric("Median Jarak Antar Pembelian", f"{median_gap:.0f} hari" if median_gap is not None else "-")
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        if not retention.empty:
+            # Heatmap retensi kohort x umur
+            fig_retention = px.imshow(
+                retention,
+                labels={'x': 'Bulan Sejak Pembelian Pertama', 'y': 'Kohort (Bulan Pembelian Pertama)', 'color': 'Retensi (%)'},
+                title='Retensi Pelanggan per Kohort Bulanan (%)',
+                color_continuous_scale='Blues',
+                aspect='auto'
+            )
+            fig_retention.update_layout(height=600)
+            st.plotly_chart(fig_retention, use_container_width=True)
+            
+            # Ukuran kohort (pelanggan baru per bulan)
+            cohort_sizes = cohorts['matrix'][0].reset_index()
+            cohort_sizes.columns = ['cohort', 'customers']
+            cohort_sizes['cohort'] = retention.index
+            
+            fig_sizes = px.bar(
+                cohort_sizes,
+                x='cohort',
+                y='customers',
+                title='Jumlah Pelanggan Baru per Kohort',
+                labels={'cohort': 'Kohort', 'customers': 'Jumlah Pelanggan Baru'},
+                color_discrete_sequence=['#1E88E5']
+            )
+            st.plotly_chart(fig_sizes, use_container_width=True)
+        else:
+            st.warning("Data tidak cukup untuk membentuk matriks kohort.")
+    else:
+        st.error("Data yang diperlukan untuk analisis kohort (customer_unique_id) tidak tersedia dalam dataset.")
+
 # Tambahkan footer
 st.markdown("---")
 st.markdown("Dashboard E-commerce Brasil")
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+import pickle
+
+import pandas as pd
+
+# Lokasi data utama dan direktori cache (relatif terhadap root repositori,
+# sama seperti path yang dipakai dashboard.py)
+MAIN_DATA_PATH = 'dashboard/main_data.csv'
+CACHE_DIR = 'dashboard/.cache'
+
+
+def cache_path(name, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{name}.pkl")
+
+
+def is_fresh(path, source_path):
+    # Cache dianggap valid jika ada dan lebih baru dari file sumbernya
+    if not os.path.exists(path):
+        return False
+    if not os.path.exists(source_path):
+        return True
+    return os.path.getmtime(path) >= os.path.getmtime(source_path)
+
+
+def read_cache(name, source_path, cache_dir=CACHE_DIR):
+    # source_path None: pakai cache apa adanya (untuk state yang diperbarui inkremental)
+    path = cache_path(name, cache_dir)
+    if source_path is None:
+        if not os.path.exists(path):
+            return None
+    elif not is_fresh(path, source_path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        # Cache rusak atau dibuat oleh versi pandas lain, bangun ulang
+        return None
+
+
+def write_cache(name, value, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_path(name, cache_dir)
+    # Tulis ke file sementara lalu rename agar proses lain tidak membaca file setengah jadi
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def read_main_data(path=MAIN_DATA_PATH):
+    df = pd.read_csv(path)
+
+    # Konversi kolom tanggal ke format datetime
+    date_columns = [col for col in df.columns if 'date' in col or 'timestamp' in col]
+    for col in date_columns:
+        try:
+            # Untuk tanggal dengan format "YYYY-MM-DD HH:MM:SS"
+            df[col] = pd.to_datetime(df[col], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        except (ValueError, TypeError):
+            # Jika format spesifik gagal, gunakan pendekatan yang lebih fleksibel
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    # Pastikan kolom year_month ada untuk analisis waktu
+    if 'year_month' not in df.columns and 'order_purchase_timestamp' in df.columns:
+        df['year_month'] = df['order_purchase_timestamp'].dt.strftime('%Y-%m')
+
+    return df
+
+
+def load_or_build(name, builder, source_path=MAIN_DATA_PATH, cache_dir=CACHE_DIR):
+    # Gunakan hasil yang sudah tersimpan jika cache masih valid,
+    # sehingga proses baru tidak perlu menghitung ulang dari CSV
+    value = read_cache(name, source_path, cache_dir)
+    if value is None:
+        value = builder()
+        try:
+            write_cache(name, value, cache_dir)
+        except OSError:
+            # Filesystem read-only: tetap lanjut tanpa cache di disk
+            pass
+    return value
+
+
+def load_main_data(path=MAIN_DATA_PATH, cache_dir=CACHE_DIR):
+    return load_or_build('main_data', lambda: read_main_data(path), path, cache_dir)
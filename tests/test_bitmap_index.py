@@ -0,0 +1,129 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Modul dashboard diimpor secara flat (sama seperti saat dijalankan oleh streamlit)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+from bitmap_index import bitmap_to_mask, build_bitmap_index, build_date_index, date_range_mask, filter_options, select_rows
+
+
+def make_frame(n=1003, seed=0):
+    # Jumlah baris sengaja bukan kelipatan 8 agar byte terakhir bitmap terisi sebagian
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'customer_state': rng.choice(['SP', 'RJ', 'MG', 'AC'], n),
+        'seller_city': rng.choice(['ibitinga', 'sao paulo', 'curitiba'], n),
+        'order_status': rng.choice(['delivered', 'shipped', 'canceled'], n),
+        'review_score': rng.choice([1.0, 2.0, 3.0, 4.0, 5.0], n),
+    })
+    # Nilai kosong tidak boleh ikut terpilih oleh filter apa pun
+    df.loc[rng.random(n) < 0.1, 'review_score'] = np.nan
+    df.loc[rng.random(n) < 0.1, 'seller_city'] = np.nan
+    return df
+
+
+def expected_mask(df, selections):
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in selections.items():
+        if values:
+            mask &= df[col].isin(values).to_numpy()
+    return mask
+
+
+def selected_mask(index, selections):
+    bits = select_rows(index, selections)
+    if bits is None:
+        return np.ones(index['n_rows'], dtype=bool)
+    return bitmap_to_mask(bits, index['n_rows'])
+
+
+def test_single_values_match_isin():
+    df = make_frame()
+    index = build_bitmap_index(df)
+
+    for col in df.columns:
+        for value in filter_options(index, col):
+            selections = {col: [value]}
+            np.testing.assert_array_equal(selected_mask(index, selections), expected_mask(df, selections))
+
+
+def test_or_within_and_across_columns():
+    df = make_frame()
+    index = build_bitmap_index(df)
+    selections = {
+        'customer_state': ['SP', 'RJ'],
+        'seller_city': ['ibitinga', 'curitiba'],
+        'review_score': [4.0, 5.0],
+    }
+
+    mask = selected_mask(index, selections)
+    np.testing.assert_array_equal(mask, expected_mask(df, selections))
+    assert mask.any()
+
+
+def test_nan_is_not_an_option():
+    df = make_frame()
+    index = build_bitmap_index(df)
+
+    assert filter_options(index, 'review_score') == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert filter_options(index, 'seller_city') == ['curitiba', 'ibitinga', 'sao paulo']
+
+    # Gabungan semua nilai tetap tidak memilih baris NaN
+    mask = selected_mask(index, {'review_score': filter_options(index, 'review_score')})
+    np.testing.assert_array_equal(mask, df['review_score'].notna().to_numpy())
+
+
+def test_unknown_values():
+    df = make_frame()
+    index = build_bitmap_index(df)
+
+    # Nilai yang tidak dikenal diabaikan jika ada nilai lain yang valid
+    selections = {'order_status': ['canceled', 'lost']}
+    np.testing.assert_array_equal(selected_mask(index, selections), expected_mask(df, selections))
+
+    # Hanya nilai yang tidak dikenal: tidak ada baris yang cocok
+    assert not selected_mask(index, {'order_status': ['lost']}).any()
+    assert not selected_mask(index, {'order_status': ['canceled'], 'review_score': [9.0]}).any()
+
+
+def test_no_active_filter():
+    df = make_frame()
+    index = build_bitmap_index(df)
+
+    assert select_rows(index, {}) is None
+    assert select_rows(index, {'customer_state': [], 'payment_type': ['boleto']}) is None
+    assert filter_options(index, 'payment_type') == []
+
+
+def test_partial_last_byte():
+    for n in (1, 7, 9, 1003):
+        df = make_frame(n, seed=n)
+        index = build_bitmap_index(df)
+        for col in df.columns:
+            assert index['columns'][col]['bitmaps'].shape[1] == (n + 7) // 8
+
+        value = df['order_status'].iloc[-1]
+        mask = selected_mask(index, {'order_status': [value]})
+        assert len(mask) == n
+        assert mask[-1]
+        np.testing.assert_array_equal(mask, expected_mask(df, {'order_status': [value]}))
+
+
+def test_date_range_matches_date_comparison():
+    rng = np.random.default_rng(1)
+    n = 1003
+    ts = pd.Series(pd.Timestamp('2017-01-01') + pd.to_timedelta(rng.integers(0, 60 * 86400, n), unit='s'))
+    ts[rng.random(n) < 0.05] = pd.NaT
+    # Tepat di batas tengah malam
+    ts.iloc[0] = pd.Timestamp('2017-01-10')
+    ts.iloc[1] = pd.Timestamp('2017-01-20 23:59:59')
+    ts.iloc[2] = pd.Timestamp('2017-01-21')
+    date_index = build_date_index(ts)
+
+    for start, end in [('2017-01-10', '2017-01-20'), ('2017-01-01', '2017-03-31'), ('2017-02-05', '2017-02-05'), ('2018-01-01', '2018-02-01')]:
+        start_date, end_date = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+        expected = ((ts.dt.date >= start_date) & (ts.dt.date <= end_date)).to_numpy()
+        np.testing.assert_array_equal(date_range_mask(date_index, start_date, end_date), expected)
@@ -0,0 +1,113 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Modul dashboard diimpor secara flat (sama seperti saat dijalankan oleh streamlit)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard'))
+
+import cohort
+
+
+def make_orders(n=4000, customers=900, days=400, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'order_id': [f'o{i}' for i in range(n)],
+        'customer_unique_id': [f'u{k}' for k in rng.integers(0, customers, n)],
+        'order_purchase_timestamp': pd.Timestamp('2017-01-01') + pd.to_timedelta(rng.integers(0, days * 86400, n), unit='s'),
+    })
+    # main_data berisi beberapa baris per pesanan (item x pembayaran)
+    return pd.concat([df, df.iloc[:300]], ignore_index=True)
+
+
+def assert_same_state(left, right):
+    assert left['last_month'] == right['last_month']
+    pd.testing.assert_frame_equal(left['matrix'], right['matrix'])
+    pd.testing.assert_frame_equal(left['customers'].sort_index(), right['customers'].sort_index())
+    np.testing.assert_allclose(np.sort(left['gap_days']), np.sort(right['gap_days']))
+    assert left['month_fingerprints'] == right['month_fingerprints']
+
+
+def test_incremental_matches_full_rebuild():
+    df = make_orders()
+    months = cohort.month_index(df['order_purchase_timestamp'])
+    full_closed, full_view = cohort.build_cohorts(df)
+
+    state = None
+    for cut in sorted(set(months))[2::3] + [months.max()]:
+        closed, view = cohort.build_cohorts(df[months <= cut], state)
+        state = closed
+
+    assert_same_state(closed, full_closed)
+    assert_same_state(view, full_view)
+
+
+def test_open_month_is_not_persisted():
+    df = make_orders()
+    months = cohort.month_index(df['order_purchase_timestamp'])
+    latest = int(months.max())
+    closed, view = cohort.build_cohorts(df)
+
+    assert closed['last_month'] == latest - 1
+    assert view['last_month'] == latest
+    assert latest not in closed['month_fingerprints']
+
+    # State tertutup sama dengan menyerap seluruh data tanpa bulan berjalan
+    assert_same_state(closed, cohort.update_cohorts(cohort.empty_state(), df[months < latest]))
+
+
+def test_matches_naive_cohort_matrix():
+    df = make_orders()
+    _, view = cohort.build_cohorts(df)
+
+    events = df.drop_duplicates('order_id').copy()
+    events['month'] = cohort.month_index(events['order_purchase_timestamp'])
+    events['cohort'] = events.groupby('customer_unique_id')['month'].transform('min')
+    events['age'] = events['month'] - events['cohort']
+    expected = events.drop_duplicates(['customer_unique_id', 'month']).groupby(['cohort', 'age']).size().unstack(fill_value=0)
+
+    np.testing.assert_array_equal(view['matrix'].to_numpy(), expected.to_numpy())
+
+
+def test_refresh_rebuilds_when_closed_months_change(tmp_path):
+    df = make_orders()
+    cohort.refresh_cohorts(df, cache_dir=str(tmp_path))
+
+    # Data dikoreksi tetapi mencakup bulan yang sama
+    subset = df[df['customer_unique_id'].isin([f'u{k}' for k in range(200)])]
+    view = cohort.refresh_cohorts(subset, cache_dir=str(tmp_path))
+    _, expected = cohort.build_cohorts(subset)
+
+    assert_same_state(view, expected)
+    assert cohort.repeat_summary(view)['customers'] == subset['customer_unique_id'].nunique()
+
+
+def test_refresh_reuses_state_for_appended_months(tmp_path):
+    df = make_orders()
+    months = cohort.month_index(df['order_purchase_timestamp'])
+    latest = int(months.max())
+
+    cohort.refresh_cohorts(df[months < latest], cache_dir=str(tmp_path))
+    state = cohort.data_cache.read_cache('cohort_state', None, str(tmp_path))
+    assert cohort.matches_source(state, cohort.order_events(df))
+
+    view = cohort.refresh_cohorts(df, cache_dir=str(tmp_path))
+    _, expected = cohort.build_cohorts(df)
+    assert_same_state(view, expected)
+
+
+def test_retention_masks_unobservable_cells():
+    df = make_orders()
+    _, view = cohort.build_cohorts(df)
+    retention = cohort.retention_table(view)
+
+    for i, cohort_month in enumerate(view['matrix'].index):
+        for age in view['matrix'].columns:
+            value = retention.iloc[i][age]
+            if cohort_month + age > view['last_month']:
+                assert np.isnan(value)
+            else:
+                assert not np.isnan(value)
+    assert (retention[0] == 100).all()
+
@@ -0,0 +1,175 @@
+import glob
+import importlib
+import os
+import sys
+
+import pytest
+
+# Paket analysis diimpor dari root repositori
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from analysis import dag
+
+# Graf kecil: orders, order_items -> orders_items -> summary, dan cabang lain order_totals
+TOY_TASKS = '''
+from analysis.dag import task
+
+DATA_DIR = {data_dir!r}
+SCALE = {scale}
+
+
+def read_numbers(path):
+    with open(path) as f:
+        return [int(line) for line in f if line.strip()]
+
+
+@task(files=[f'{{DATA_DIR}}/orders.csv'])
+def orders():
+    return read_numbers(f'{{DATA_DIR}}/orders.csv')
+
+
+@task(files=[f'{{DATA_DIR}}/order_items.csv'])
+def order_items():
+    return read_numbers(f'{{DATA_DIR}}/order_items.csv')
+
+
+@task('orders', 'order_items')
+def orders_items(orders_df, order_items_df):
+    return [o * i for o in orders_df for i in order_items_df]
+
+
+@task('orders_items')
+def summary(orders_items_df):
+    return sum(orders_items_df) * SCALE
+
+
+@task('order_items')
+def order_totals(order_items_df):
+    return {{'count': len(order_items_df), 'total': sum(order_items_df)}}
+'''
+
+TARGETS = ['summary', 'order_totals']
+
+
+class ToyGraph:
+    def __init__(self, root, module_name):
+        self.data_dir = str(root / 'data')
+        self.cache_dir = str(root / 'cache')
+        self.module_path = str(root / f'{module_name}.py')
+        self.module_name = module_name
+        self.module = None
+        self.version = 0
+        os.makedirs(self.data_dir)
+        self.write_data('orders.csv', [1, 2, 3])
+        self.write_data('order_items.csv', [10, 20])
+
+    def write_data(self, filename, numbers):
+        with open(os.path.join(self.data_dir, filename), 'w') as f:
+            f.write(''.join(f'{n}\n' for n in numbers))
+
+    def write_module(self, scale=2):
+        with open(self.module_path, 'w') as f:
+            f.write(TOY_TASKS.format(data_dir=self.data_dir, scale=scale))
+        # mtime dinaikkan agar bytecode lama tidak dipakai meskipun ukuran file sama
+        self.version += 1
+        mtime = os.path.getmtime(self.module_path) + self.version * 10
+        os.utime(self.module_path, (mtime, mtime))
+        importlib.invalidate_caches()
+        if self.module is None:
+            self.module = importlib.import_module(self.module_name)
+        else:
+            importlib.reload(self.module)
+
+    def keys(self):
+        return dag.task_keys(dag.resolve_order(TARGETS))
+
+    def run(self, workers=1, cache_dir=None):
+        log = []
+        results = dag.run(TARGETS, workers=workers, cache_dir=cache_dir or self.cache_dir, log=log.append)
+        ran = {line.split(' ', 1)[1] for line in log if line.startswith('[run]')}
+        return results, ran
+
+    def pickles(self, name):
+        return sorted(glob.glob(os.path.join(self.cache_dir, f'{name}-*.pkl')))
+
+
+@pytest.fixture
+def graph(tmp_path, monkeypatch, request):
+    # Registri task diganti agar task analisis asli tidak tercampur
+    monkeypatch.setattr(dag, 'TASKS', {})
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module_name = f'toy_tasks_{request.node.name}'
+    toy = ToyGraph(tmp_path, module_name)
+    toy.write_module()
+    yield toy
+    sys.modules.pop(module_name, None)
+
+
+def test_unchanged_rerun_is_served_from_cache(graph):
+    results, ran = graph.run()
+    assert ran == {'orders', 'order_items', 'orders_items', 'summary', 'order_totals'}
+    assert results == {'summary': 360, 'order_totals': {'count': 2, 'total': 30}}
+
+    cached, ran = graph.run()
+    assert ran == set()
+    assert cached == results
+
+
+def test_constant_change_invalidates_only_readers(graph):
+    graph.run()
+    before = graph.keys()
+
+    graph.write_module(scale=3)
+    after = graph.keys()
+    assert {name for name in after if after[name] != before[name]} == {'summary'}
+
+    results, ran = graph.run()
+    assert ran == {'summary'}
+    assert results['summary'] == 540
+
+
+def test_input_file_change_invalidates_downstream(graph):
+    graph.run()
+    before = graph.keys()
+
+    graph.write_data('orders.csv', [1, 2, 4])
+    after = graph.keys()
+    assert {name for name in after if after[name] != before[name]} == {'orders', 'orders_items', 'summary'}
+
+    results, ran = graph.run()
+    assert ran == {'orders', 'orders_items', 'summary'}
+    assert results['summary'] == 420
+
+    # Sentuhan tanpa perubahan isi tidak membatalkan cache
+    os.utime(os.path.join(graph.data_dir, 'order_items.csv'))
+    assert graph.keys() == after
+
+
+def test_stale_results_are_pruned(graph):
+    graph.run()
+    orders_items_pickles = graph.pickles('orders_items')
+    old_orders = graph.pickles('orders')
+
+    # Prefix 'orders-' tidak boleh menghapus hasil 'orders_items-*'
+    keep_path = dag.result_path('orders', 'f' * 64, graph.cache_dir)
+    open(keep_path, 'wb').close()
+    dag.remove_stale_results('orders', keep_path)
+    assert graph.pickles('orders') == [keep_path]
+    assert graph.pickles('orders_items') == orders_items_pickles
+    os.remove(keep_path)
+
+    graph.write_data('orders.csv', [5])
+    graph.run()
+    for name in graph.keys():
+        assert len(graph.pickles(name)) == 1
+    assert graph.pickles('orders') != old_orders
+    assert graph.pickles('orders_items') != orders_items_pickles
+    assert graph.pickles('order_items') == [dag.result_path('order_items', graph.keys()['order_items'], graph.cache_dir)]
+
+
+def test_serial_and_parallel_results_match(graph, tmp_path):
+    serial, _ = graph.run(workers=1, cache_dir=str(tmp_path / 'serial'))
+    parallel, ran = graph.run(workers=2, cache_dir=str(tmp_path / 'parallel'))
+
+    assert ran == {'orders', 'order_items', 'orders_items', 'summary', 'order_totals'}
+    assert parallel == serial